@@ -161,8 +161,7 @@ class Board:
         
         # Check if any ships are hit
         for ship in self.ships:
-            if cell in ship.get_cells():
-                ship.receive_damage(cell)
+            if ship.receive_damage(cell):
                 is_ship_hit = True
                 if ship.has_sunk():
                     has_ship_sunk = True
@@ -6,8 +6,6 @@ from battleship.convert import CellConverter
 class Player:
     """ Class representing the player
     """
-    count = 0  # for keeping track of number of players
-    
     def __init__(self, board=None, name=None):
         """ Initialises a new player with its board.
 
@@ -22,15 +20,56 @@ class Player:
         else:
             self.board = board
         
-        Player.count += 1
+        # Default names are derived from the instance itself rather than a 
+        # shared counter, so creating players has no class-level side effects
         if name is None:
-            self.name = f"Player {self.count}"
+            self.name = f"Player {id(self):x}"
         else:
             self.name = name
+        
+        # The board's dimensions never change, so keep them to hand
+        self.width = self.board.width
+        self.height = self.board.height
+        
+        # Bitmap of the cells this player has attacked (or ruled out), one 
+        # byte per cell of the board, indexed row by row
+        self.visited = bytearray(self.width * self.height)
     
     def __str__(self):
         return self.name
     
+    def cell_unvisited(self, cell):
+        """ Returns True if the cell has not yet been attacked.
+        
+        Raises:
+            ValueError: if the cell does not lie within the board
+        """
+        return not self.visited[self._cell_index(cell)]
+    
+    def mark_visited(self, cell):
+        """ Records that a cell within the board has been attacked.
+        
+        Raises:
+            ValueError: if the cell does not lie within the board
+        """
+        self.visited[self._cell_index(cell)] = 1
+    
+    def _cell_index(self, cell):
+        """ Get the index of a cell in the visited bitmap.
+        
+        Cells outside the board would otherwise wrap onto another row (or the
+        end of the bitmap), so they are rejected.
+        """
+        if not self.is_valid_target(cell):
+            raise ValueError(f"The cell {cell} is not on the board.")
+        x, y = cell
+        return (y - 1) * self.width + x - 1
+    
+    def is_valid_target(self, cell):
+        """ Checks if a cell lies within the board """
+        x, y = cell
+        return 1 <= x <= self.width and 1 <= y <= self.height
+    
     def select_target(self):
         """ Select target coordinates to attack.
         
@@ -80,6 +119,7 @@ class ManualPlayer(Player):
         """
         super().__init__(board=board, name=name)
         self.converter = CellConverter((board.width, board.height))
+        self._from_str = self.converter.from_str
         
     def select_target(self):
         """ Read coordinates from user prompt.
@@ -93,7 +133,7 @@ class ManualPlayer(Player):
         while True:
             try:
                 coord_str = input('coordinates target = ')
-                x, y = self.converter.from_str(coord_str)
+                x, y = self._from_str(coord_str)
                 return x, y
             except ValueError as error:
                 print(error)
@@ -113,139 +153,91 @@ class RandomPlayer(Player):
         """
         # Initialise with a board with ships automatically arranged.
         super().__init__(board=Board(), name=name)
-        self.tracker = set()
+        
+        # Every cell on the board in a random order. Targets are popped from 
+        # the end, so we never have to retry a cell that was already attacked
+        self.unvisited_cells = [(x, y) for x in range(1, self.width + 1)
+                                for y in range(1, self.height + 1)]
+        random.shuffle(self.unvisited_cells)
 
     def select_target(self):
         """ Generate a random cell that has previously not been attacked.
         
-        Also adds cell to the player's tracker.
+        Also marks the cell as visited.
         
         Returns:
             tuple[int, int] : (x, y) cell coordinates at which to launch the 
                 next attack
         """
         target_cell = self.generate_random_target()
-        self.tracker.add(target_cell)
+        self.mark_visited(target_cell)
         return target_cell
 
     def generate_random_target(self):
         """ Generate a random cell that has previously not been attacked.
-               
-        Returns:
-            tuple[int, int] : (x, y) cell coordinates at which to launch the 
-                next attack
-        """
-        has_been_attacked = True
-        random_cell = None
         
-        while has_been_attacked:
-            random_cell = self.get_random_coordinates()
-            has_been_attacked = random_cell in self.tracker
-
-        return random_cell
-
-    def get_random_coordinates(self):
-        """ Generate random coordinates.
+        Cells are drawn from a list shuffled once in __init__(), skipping any
+        cell already marked in self.visited, so each call takes bounded time.
                
         Returns:
             tuple[int, int] : (x, y) cell coordinates at which to launch the 
                 next attack
         """
-        x = random.randint(1, self.board.width)
-        y = random.randint(1, self.board.height)
-        return (x, y)
+        random_cell = self.unvisited_cells.pop()
+        while not self.cell_unvisited(random_cell):
+            random_cell = self.unvisited_cells.pop()
+        return random_cell
 
 
-class AutomaticPlayer(Player):
-    """ Player playing automatically using a strategy."""
+class AutomaticPlayer(RandomPlayer):
+    """ Player playing automatically using a strategy.
+    
+    Attacks random cells (as a RandomPlayer) until it hits a ship, then 
+    hunts that ship down.
+    """
+    # (dx, dy) offsets of the 4 adjacent neighbours of a cell
+    ADJACENT_OFFSETS = ((0, -1), (1, 0), (-1, 0), (0, 1))
+    
     def __init__(self, name=None):
         """ Initialise the player with an automatic board and other attributes.
         
         Args:
             name (str): Player's name
         """
-        # Initialise with a board with ships automatically arranged.
-        super().__init__(board=Board(), name=name)
+        # Initialise with a board with ships automatically arranged, and the
+        # shuffled cells to draw random targets from.
+        super().__init__(name=name)
         
         # Initialise a set of objects to keep a record of what has happened
-        self.tracker = set()
         self.moves = list()
+        self._moves_append = self.moves.append
         self.attack_successful = False
         self.ship_being_attacked = list()
         
-    def is_valid_target(self, cell):
-        """ Checks if a cell lies within the board """
-        x_min = 1
-        y_min = 1
-        x_max = self.board.width
-        y_max = self.board.height        
-        x = cell[1]
-        y = cell[0]        
-        return (x_min <= x <= x_max and y_min <= y <= y_max)
-    
-    def cell_unvisited(self, cell):
-        """ Returns True if the cell has not yet been attacked."""
-        return cell not in self.tracker
-    
-    def get_random_coordinates(self):
-        """ Generate random coordinates.
-               
-        Returns:
-            tuple[int, int] : (x, y) cell coordinates at which to launch the 
-                next attack
-        """
-        x = random.randint(1, self.board.width)
-        y = random.randint(1, self.board.height)
-        return (x, y)
-    
-    def generate_random_target(self):
-        """ Generate a random cell that has previously not been attacked.
-               
-        Returns:
-            tuple[int, int] : (x, y) cell coordinates at which to launch the 
-                next attack
-        """
-        has_been_attacked = True
-        random_cell = None
+        # Every cell of the board, in the same order as the visited bitmap
+        self.cells = [(x, y) for y in range(1, self.height + 1)
+                      for x in range(1, self.width + 1)]
         
-        while has_been_attacked:
-            random_cell = self.get_random_coordinates()
-            has_been_attacked = random_cell in self.tracker
-
-        return random_cell
-    
-    def all_surrounding_cells(self, cell):
-        """ For a given cell, return all of its neighbours, including diagonals.
+        # The neighbours of a cell never change for a given board, so work 
+        # out the bitmap indices of each cell's neighbours once up front
+        self.adjacent_indices = [
+            self.neighbour_indices(cell, AutomaticPlayer.ADJACENT_OFFSETS)
+            for cell in self.cells]
         
-        The list will remove any cells previously visited or outside grid range.
+    def neighbour_indices(self, cell, offsets):
+        """ Get the bitmap indices of the neighbours of a cell on the board.
         
         Input:
             cell (tuple[int, int]) : (x, y) cell coordinates 
+            offsets (tuple[tuple[int, int]]) : (dx, dy) offsets of neighbours
         Returns:
-            (list) : surrounding cells on grid and not yet visited
-        
+            (list) : bitmap indices of the neighbours within the board
         """
-        x = cell[1]
-        y = cell[0]
-        
-        top_left = tuple([y-1,x-1])
-        top_mid = tuple([y-1,x])
-        top_right = tuple([y-1,x+1])
-        left = tuple([y,x-1])
-        right = tuple([y,x+1])
-        bot_left = tuple([y+1,x-1])
-        bot_mid = tuple([y+1,x])
-        bot_right = tuple([y+1,x+1])
-        
-        cells = [top_left, top_mid, top_right, left, right, bot_left, bot_mid, bot_right]
-        
-        # Remove any that are out of bounds
-        cells = [cell for cell in cells if self.is_valid_target(cell)]
-        
-        # Also remove any we've already visited
-        cells = [cell for cell in cells if self.cell_unvisited(cell)]
-        
-        return cells
+        x, y = cell
+        width = self.width
+        is_valid_target = self.is_valid_target
+        return [(y + dy - 1) * width + x + dx - 1 for dx, dy in offsets
+                if is_valid_target((x + dx, y + dy))]
     
     def receive_result(self, is_ship_hit, has_ship_sunk):
         """ Receive results of latest attack and updates player attributes.
@@ -270,11 +262,22 @@ class AutomaticPlayer(Player):
             self.attack_successful = False
            
         if has_ship_sunk:
-            # We need to remove all adjacent cells from future consideration
-            for cell in self.ship_being_attacked:
-                for surrounding_cell in self.all_surrounding_cells(cell):                    
-                    self.tracker.add(surrounding_cell)
-            self.ship_being_attacked = list()
+            # We need to remove all adjacent cells from future consideration.
+            # The ship is a straight line, so these all lie in its bounding 
+            # rectangle grown by one cell (clamped to the board)
+            width = self.width
+            visited = self.visited
+            x_coords = [cell[0] for cell in self.ship_being_attacked]
+            y_coords = [cell[1] for cell in self.ship_being_attacked]
+            x_min = max(min(x_coords) - 1, 1)
+            x_max = min(max(x_coords) + 1, width)
+            y_min = max(min(y_coords) - 1, 1)
+            y_max = min(max(y_coords) + 1, self.height)
+            for y in range(y_min, y_max + 1):
+                row_start = (y - 1) * width
+                visited[row_start + x_min - 1:row_start + x_max] = (
+                    b'\x01' * (x_max - x_min + 1))
+            self.ship_being_attacked.clear()
             
         
     def get_adjacent_cells(self, cell):
@@ -286,39 +289,21 @@ class AutomaticPlayer(Player):
         Returns:
             (list) : list of tuples for potential next targets.
         """
-        x_min = 1
-        y_min = 1
-        x_max = self.board.width
-        y_max = self.board.height
-        
-        x = cell[1]
-        y = cell[0]
-        
-        if x - 1 >= x_min:
-            left = tuple([y, x - 1])
-        else:
-            left = tuple([y, x]) 
-        
-        if x + 1 <= x_max:
-            down = tuple([y, x + 1])
-        else:
-            down = tuple([y, x])
+        cells = self.cells
+        visited = self.visited
+        index = (cell[1] - 1) * self.width + cell[0] - 1
+        return [cells[i] for i in self.adjacent_indices[index] 
+                if not visited[i]]
+    
+    def _commit_target(self, cell):
+        """ Mark a cell as visited and log it as our latest move.
         
-        if y - 1 >= y_min:
-            up = tuple([y - 1, x])
-        else:
-            up = tuple([y, x])
-
-        if y + 1 <= y_max:
-            right = tuple([y + 1, x])
-        else:
-            right = tuple([y, x])
-
-            
-        potential_targets =  [left, right, up, down]
-        targets = [cell for cell in potential_targets if self.cell_unvisited(cell)]
-        targets = [cell for cell in targets if self.is_valid_target(cell)]
-        return targets
+        Returns:
+            tuple[int, int] : the given (x, y) cell coordinates
+        """
+        self.mark_visited(cell)
+        self._moves_append(cell)
+        return cell
     
     def select_target(self):
         """ If we don't know anything, attack a random cell not yet attacked.
@@ -330,91 +315,51 @@ class AutomaticPlayer(Player):
             tuple[int, int] : (x, y) cell coordinates at which to launch the 
                 next attack
         """        
+        ship_being_attacked = self.ship_being_attacked
+        hits = len(ship_being_attacked)
         
         # If we have no ship yet being attacked, select a random cell
-        if len(self.ship_being_attacked) == 0:
+        if hits == 0:
             target_cell = self.generate_random_target()
-            self.tracker.add(target_cell)
-            self.moves.append(target_cell)
-            return target_cell
+            return self._commit_target(target_cell)
         
         
         # If we have only a single hit, try hitting an adjacent cell
-        if len(self.ship_being_attacked) == 1:
-            previous_successful_hit = self.ship_being_attacked[0]
+        if hits == 1:
+            previous_successful_hit = ship_being_attacked[0]
             potential_targets = self.get_adjacent_cells(previous_successful_hit)
-            # Select a random cell to target
-            target_cell = random.choice(potential_targets)
-            self.tracker.add(target_cell)
-            self.moves.append(target_cell)
-            return target_cell
-        
-        
-        # If we've got successive attacks, figure out the orientation of the ship
-        if len(self.ship_being_attacked) > 1:
-            
-            if self.ship_being_attacked[0][0] == self.ship_being_attacked[1][0]:
-                orientation = 'vertical'
+            # Select a random cell to target, or any random cell if every 
+            # adjacent cell has already been visited
+            if potential_targets:
+                target_cell = random.choice(potential_targets)
             else:
-                orientation = 'horizontal'
-        
-            # Attack the next square in that direction
-            if orientation == 'horizontal':
-                # Attack last registered hit to left if possible
-                potential_target =  tuple([self.ship_being_attacked[-1][0] - 1, self.ship_being_attacked[-1][1]])
-                if (self.cell_unvisited(potential_target) and self.is_valid_target(potential_target)):
-                    target_cell = potential_target
-                    self.tracker.add(target_cell)
-                    self.moves.append(target_cell)
-                    return target_cell
-                potential_target =  tuple([self.ship_being_attacked[-1][0] + 1, self.ship_being_attacked[-1][1]])
-                if (self.cell_unvisited(potential_target) and self.is_valid_target(potential_target)):
-                    target_cell = potential_target
-                    self.tracker.add(target_cell)
-                    self.moves.append(target_cell)
-                    return target_cell
-                # Otherwise, attack first registered target on this ship to the right
-                potential_target =  tuple([self.ship_being_attacked[0][0] + 1, self.ship_being_attacked[0][1]])
-                if (self.cell_unvisited(potential_target) and self.is_valid_target(potential_target)):
-                    target_cell = potential_target
-                    self.tracker.add(target_cell)
-                    self.moves.append(target_cell)
-                    return target_cell
-                else:
-                    potential_target =  tuple([self.ship_being_attacked[0][0] - 1, self.ship_being_attacked[0][1]])
-                    target_cell = potential_target
-                    self.tracker.add(target_cell)
-                    self.moves.append(target_cell)
-                    return target_cell
-            
-            if orientation == 'vertical':
-                # Attack the square above last successful attack, if possible
-                potential_target = tuple([self.ship_being_attacked[-1][0], self.ship_being_attacked[-1][1] - 1])
-                if (self.cell_unvisited(potential_target) and self.is_valid_target(potential_target)):
-                    target_cell = potential_target
-                    self.tracker.add(target_cell)
-                    self.moves.append(target_cell)
-                    return target_cell
-                # If we can't, attack the square below the last successful attack
-                potential_target = tuple([self.ship_being_attacked[-1][0], self.ship_being_attacked[-1][1] + 1])
-                if (self.cell_unvisited(potential_target) and self.is_valid_target(potential_target)):
-                    target_cell = potential_target
-                    self.tracker.add(target_cell)
-                    self.moves.append(target_cell)
-                    return target_cell
-                # Otherwise, go back to the first cell in the attack and repeat
-                potential_target = tuple([self.ship_being_attacked[0][0], self.ship_being_attacked[0][1] - 1])
-                if (self.cell_unvisited(potential_target) and self.is_valid_target(potential_target)):
-                    target_cell = potential_target
-                    self.tracker.add(target_cell)
-                    self.moves.append(target_cell)
-                    return target_cell
-                else:
-                    potential_target = tuple([self.ship_being_attacked[0][0], self.ship_being_attacked[0][1] + 1])
-                    target_cell = potential_target
-                    self.tracker.add(target_cell)
-                    self.moves.append(target_cell)
-                    return target_cell
-
+                target_cell = self.generate_random_target()
+            return self._commit_target(target_cell)
         
-            
+        
+        # If we've got successive attacks, figure out the orientation of the 
+        # ship as a (dx, dy) step along it
+        first_hit = ship_being_attacked[0]
+        last_hit = ship_being_attacked[-1]
+        if first_hit[0] == ship_being_attacked[1][0]:
+            dx, dy = 0, 1 # vertical
+        else:
+            dx, dy = 1, 0 # horizontal
+        
+        # Held locally so each candidate is checked inline against the 
+        # board bounds and the visited bitmap, without any method calls
+        width, height = self.width, self.height
+        visited = self.visited
+        
+        # Attack either side of the last registered hit if possible. 
+        # Otherwise, go back to the first hit on this ship and repeat
+        for x, y in ((last_hit[0] - dx, last_hit[1] - dy),
+                     (last_hit[0] + dx, last_hit[1] + dy),
+                     (first_hit[0] + dx, first_hit[1] + dy),
+                     (first_hit[0] - dx, first_hit[1] - dy)):
+            if (1 <= x <= width and 1 <= y <= height 
+                    and not visited[(y - 1) * width + x - 1]):
+                return self._commit_target((x, y))
+        
+        # Nowhere left to go along this ship, so fall back to a random cell
+        return self._commit_target(self.generate_random_target())
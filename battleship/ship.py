@@ -5,6 +5,10 @@ from battleship.convert import CellConverter
 class Ship:
     """ Represent a ship that is placed on the board.
     """
+    __slots__ = ('x_start', 'y_start', 'x_end', 'y_end', 'cells', 
+                 '_is_vertical', '_is_horizontal', '_length', '_full_mask', 
+                 '_damage', '_halo')
+    
     def __init__(self, start, end, should_validate=True):
         """ Creates a ship given its start and end coordinates on the board. 
         
@@ -37,16 +41,51 @@ class Ship:
             min(self.y_start, self.y_end), max(self.y_start, self.y_end)
         )
         
+        # The coordinates never change, so neither does the orientation
+        self._is_vertical = self.x_start == self.x_end
+        self._is_horizontal = self.y_start == self.y_end
+        
         if should_validate:
-            if not self.is_horizontal() and not self.is_vertical():
+            if not self._is_horizontal and not self._is_vertical:
                 raise ValueError("The given coordinates are invalid. "
                     "The ship needs to be either horizontal or vertical.")
 
         # Set of all (x,y) cell coordinates that the ship occupies
         self.cells = self.get_cells()
         
-        # Set of (x,y) cell coordinates of the ship that have been damaged
-        self.damaged_cells = set()
+        # Number of cells the ship occupies, along the axis used by get_cells
+        if self._is_vertical:
+            self._length = self.y_end - self.y_start + 1
+        else:
+            self._length = self.x_end - self.x_start + 1
+        
+        # Bitmask of the damaged cells of the ship, where bit i is set once the
+        # i-th cell from (x_start, y_start) has been hit. The ship has sunk 
+        # once every one of its cells is set, i.e. the mask is full
+        self._damage = 0
+        self._full_mask = (1 << self._length) - 1
+        
+        # Set of cells near the ship, only built if it is asked for
+        self._halo = None
+    
+    @property
+    def damaged_cells(self):
+        """ Set of (x,y) cell coordinates of the ship that have been damaged."""
+        return {(x, y) for (x, y) in self.cells 
+                if self._damage >> (x - self.x_start + y - self.y_start) & 1}
+    
+    @property
+    def halo(self):
+        """ Set of (x,y) cell coordinates that are near the ship.
+        
+        These are the ship's own cells plus the ring of cells around it (see
+        is_near_cell). Cells beyond the board are included.
+        """
+        if self._halo is None:
+            self._halo = {(x, y) 
+                          for x in range(self.x_start - 1, self.x_end + 2)
+                          for y in range(self.y_start - 1, self.y_end + 2)}
+        return self._halo
     
     def __len__(self):
         return self.length()
@@ -61,7 +100,7 @@ class Ship:
         Returns:
             bool : True if the ship is vertical. False otherwise.
         """
-        return self.x_start == self.x_end
+        return self._is_vertical
    
     def is_horizontal(self):
         """ Check whether the ship is horizontal.
@@ -69,7 +108,7 @@ class Ship:
         Returns:
             bool : True if the ship is horizontal. False otherwise.
         """
-        return self.y_start == self.y_end
+        return self._is_horizontal
     
     def get_cells(self):
         """ Get the set of all cell coordinates that the ship occupies.
@@ -82,13 +121,10 @@ class Ship:
         Returns:
             set[tuple] : Set of (x ,y) coordinates of all cells a ship occupies
         """
-        if self.is_vertical():
-          y_coords = list(range(self.y_start, self.y_end + 1))
-          occupied_coords = [(self.x_start, y) for y in y_coords]
+        if self._is_vertical:
+            return {(self.x_start, y) for y in range(self.y_start, self.y_end + 1)}
         else:
-          x_coords = list(range(self.x_start, self.x_end + 1))
-          occupied_coords = [(x, self.y_start) for x in x_coords]        
-        return set(occupied_coords)
+            return {(x, self.y_start) for x in range(self.x_start, self.x_end + 1)}
 
     def length(self):
         """ Get length of ship (the number of cells the ship occupies).
@@ -96,15 +132,10 @@ class Ship:
         Returns:
             int : The number of cells the ship occupies
         """
-        x_coords = [item[0] for item in list(self.cells)]
-        y_coords = [item[1] for item in list(self.cells)]
-        x_domain = max(x_coords) - min(x_coords) + 1
-        y_domain = max(y_coords) - min(y_coords) + 1
-        length = max(x_domain, y_domain)
-        if length > 5:
+        if self._length > 5:
             return ValueError
         else:
-            return length 
+            return self._length
 
     def is_occupying_cell(self, cell):
         """ Check whether the ship is occupying a given cell
@@ -117,7 +148,13 @@ class Ship:
             bool : return True if the given cell is one of the cells occupied 
                 by the ship. Otherwise, return False
         """
-        return cell in self.cells
+        # Same cells as get_cells(): the ship runs along the x_start column if 
+        # it is vertical, and along the y_start row otherwise
+        x, y = cell
+        if self._is_vertical:
+            return x == self.x_start and self.y_start <= y <= self.y_end
+        else:
+            return y == self.y_start and self.x_start <= x <= self.x_end
     
     def receive_damage(self, cell):
         """ Receive attack at given cell. 
@@ -135,8 +172,10 @@ class Ship:
             bool : return True if the ship is occupying cell (ship is hit). 
                 Return False otherwise.
         """
-        if cell in self.cells:
-            self.damaged_cells.add(cell)
+        # The ship lies along a single row or column, so the cell's offset from
+        # the start gives its bit in the damage mask
+        if self.is_occupying_cell(cell):
+            self._damage |= 1 << (cell[0] - self.x_start + cell[1] - self.y_start)
             return True
         else:
             return False
@@ -147,7 +186,7 @@ class Ship:
         Returns:
             int : the number of cells that are damaged.
         """
-        return len(self.damaged_cells)
+        return bin(self._damage).count("1")
         
     def has_sunk(self):
         """ Check whether the ship has sunk.
@@ -156,15 +195,14 @@ class Ship:
             bool : return True if the ship is damaged at all its positions. 
                 Otherwise, return False
         """
-        if self.length() == self.count_damaged_cells():
-            return True
-        else:
-            return False
+        return self._damage == self._full_mask
     
     def is_near_ship(self, other_ship):
         """ Check whether a ship is near another ship instance.
         
-        Hint: Use the method is_near_cell(...) to complete this method.
+        The ships are near if the other ship overlaps this ship's bounding 
+        box grown by one cell in every direction, i.e. if any of its cells 
+        would satisfy is_near_cell(...).
 
         Args:
             other_ship (Ship): another Ship instance against which to compare
@@ -173,10 +211,10 @@ class Ship:
             bool : returns True if and only if the coordinate of other_ship is 
                 near to this ship. Returns False otherwise.
         """
-        for other_ship_cell in other_ship.cells:
-            if self.is_near_cell(other_ship_cell):
-                return True
-        return False
+        return (self.x_start-1 <= other_ship.x_end 
+                and other_ship.x_start <= self.x_end+1
+                and self.y_start-1 <= other_ship.y_end 
+                and other_ship.y_start <= self.y_end+1)
 
     def is_near_cell(self, cell):
         """ Check whether the ship is near an (x,y) cell coordinate.
@@ -253,12 +291,13 @@ class ShipFactory:
         The number and length of ships generated must obey the specifications 
         given in self.ships_per_length.
         
-        The ships must also not overlap with each other, and must also not be 
+        The ships must also not overlap with each other, and must also not be
         too close to one another (as defined earlier in Ship::is_near_ship()).
-        This is done in the while() loop. If we have an impossible 
-        ships_per_length to satisfy, we try to fit as many ships on the grid 
-        as possible but will terminate at some point, hence the counter to 
-        limit the while loop from running indefinitely.
+        Each candidate ship is redrawn, up to 1000 times, until its cells are
+        disjoint from the forbidden set of placed ships and their surrounding
+        cells. If we have an impossible ships_per_length to satisfy, a ship
+        that never fits is dropped, and Board::validate_ships() then raises
+        its error about the number of ships.
         
         The coordinates should also be valid given self.board_size
         
@@ -267,22 +306,22 @@ class ShipFactory:
         """
         ships = [] # Initialise list to collect Ship objects
         
-        for ships_to_build in [item for item in self.ships_per_length.items()]:
-            ship_number = ships_to_build[1] # default is 1 per length
-            ship_length = ships_to_build[0]
-            for ship_to_build in range(0, ship_number): # build n ships per length
-                ship = self.build_ship(length = ship_length)
-                if len(ships) == 0: # if our list is empty, add the first ship
-                    ships.append(ship)
-                else:
-                    i = 1
-                    # Check if the ship is too close to our existing ships
-                    while i < 1000: 
-                        if any(ship.is_near_ship(other_ship) for other_ship in ships):
-                            ship = self.build_ship(length = ship_length)
-                        i += 1
-                    # If not, add it into the list of ships
-                    ships.append(ship)   
+        # Cells that new ships must not occupy: every placed ship plus the 
+        # ring of cells around it. Checking a candidate against this set 
+        # replaces comparing it with each placed ship in turn
+        forbidden = set()
+        
+        # default is 1 ship per length
+        for ship_length, ship_number in self.ships_per_length.items():
+            for ship_to_build in range(ship_number): # build n ships per length
+                # Keep building until the ship is clear of our existing ships,
+                # giving up on it after a bounded number of attempts
+                for attempt in range(1000):
+                    ship = self.build_ship(length = ship_length)
+                    if ship.cells.isdisjoint(forbidden):
+                        ships.append(ship)
+                        forbidden |= ship.halo
+                        break
         return ships
                         
         
@@ -299,11 +338,8 @@ class ShipFactory:
             existing_ships (list) : list of already created Ship instances 
             
         Returns:
-            Ship : a Ship instance created from start to end string coordinates
+            Ship : a Ship instance created from start to end coordinates
         """
-        
-        converter = CellConverter(self.board_size)
-        
         # Specify valid grid limits
         min_valid_x = 1
         min_valid_y = 1
@@ -311,26 +347,26 @@ class ShipFactory:
         max_valid_y = self.board_size[1]
         
         # Create random starting coords
-        x_start = random.randint(min_valid_x, max_valid_x)
-        y_start = random.randint(min_valid_y, max_valid_y)
-        cell_start = converter.to_str(tuple([x_start, y_start]))
+        x_start = random.randrange(min_valid_x, max_valid_x + 1)
+        y_start = random.randrange(min_valid_y, max_valid_y + 1)
         
-        # Generate a random direction for the ship to build out from
+        # Generate a random direction for the ship to build out from. The ship
+        # is horizontal or vertical by construction, so needs no validation
         rand_dir = random.random()
         if rand_dir < 0.5: # note a *very* minor bias due to inequality
             # We build horizontally
             x_end = x_start + 1 - length # by default build left
             if x_end < min_valid_x: # but build right if we go out of bounds
                 x_end = x_start - 1 + length
-            cell_end = converter.to_str(tuple([x_end, y_start]))
-            ship = ShipFactory.create_ship_from_str(cell_start, cell_end)
+            ship = Ship(start=(x_start, y_start), end=(x_end, y_start), 
+                        should_validate=False)
         else:
             # We build vertically
             y_end = y_start -1 + length # by default build down
             if y_end > max_valid_y:
                 y_end = y_start + 1 - length
-            cell_end = converter.to_str(tuple([x_start, y_end]))
-            ship = ShipFactory.create_ship_from_str(cell_start, cell_end)
+            ship = Ship(start=(x_start, y_start), end=(x_start, y_end), 
+                        should_validate=False)
         
         return ship     
         
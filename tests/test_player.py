@@ -2,37 +2,142 @@ import unittest
 import random
 import sys
 sys.path.append("../")
-from battleship.player import RandomPlayer
+from battleship.player import Player, RandomPlayer, AutomaticPlayer
 from battleship.board import Board
 
-board=Board()
 
-tracker = set()
-moves = list()
-attack_successful = False
-ship_being_attacked = list()
+class TestPlayerMethods(unittest.TestCase):
+    
+    def test_mark_visited(self):
+        player = Player()
+        self.assertTrue(player.cell_unvisited((10, 1)))
+        player.mark_visited((10, 1))
+        self.assertFalse(player.cell_unvisited((10, 1)))
+        self.assertTrue(player.cell_unvisited((1, 2)))
+        
+        
+    def test_off_board_cells_raise_error(self):
+        player = Player()
+        for cell in [(11, 1), (1, 0)]:
+            with self.assertRaises(ValueError):
+                player.cell_unvisited(cell)
+            with self.assertRaises(ValueError):
+                player.mark_visited(cell)
+        self.assertEqual(player.visited, bytearray(100))
 
-width = board.width
-height = board.height
 
-cell = (9,0)
+class TestAutomaticPlayerMethods(unittest.TestCase):
+    
+    def attack_ship(self, hits, misses=()):
+        """ Create an AutomaticPlayer part-way through attacking a ship."""
+        player = AutomaticPlayer()
+        for cell in list(hits) + list(misses):
+            player.mark_visited(cell)
+        player.ship_being_attacked.extend(hits)
+        return player
 
-def is_valid_target(cell):
-    """ Checks if a cell lies within the board """
-    x_min = 1
-    y_min = 1
-    x_max = board.width
-    y_max = board.height        
-    x = cell[0]
-    y = cell[1]        
-    return (x_min <= x <= x_max and y_min <= y <= y_max)
+    def test_horizontal_target(self):
+        player = self.attack_ship(hits=[(5, 5), (6, 5)])
+        self.assertEqual(player.select_target(), (7, 5))
+        
+        
+    def test_horizontal_target_back_to_first_hit(self):
+        player = self.attack_ship(hits=[(5, 5), (6, 5)], misses=[(7, 5)])
+        self.assertEqual(player.select_target(), (4, 5))
+        
+        
+    def test_vertical_target(self):
+        player = self.attack_ship(hits=[(3, 3), (3, 4)])
+        self.assertEqual(player.select_target(), (3, 5))
+        
+        
+    def test_vertical_target_back_to_first_hit(self):
+        player = self.attack_ship(hits=[(3, 3), (3, 4)], misses=[(3, 5)])
+        self.assertEqual(player.select_target(), (3, 2))
+        
+        
+    def test_target_at_board_edge(self):
+        player = self.attack_ship(hits=[(9, 1), (10, 1)])
+        self.assertEqual(player.select_target(), (8, 1))
+        
+        
+    def test_blocked_ship_falls_back_to_random(self):
+        misses = [(4, 5), (7, 5)]
+        player = self.attack_ship(hits=[(5, 5), (6, 5)], misses=misses)
+        target = player.select_target()
+        self.assertTrue(player.is_valid_target(target))
+        self.assertNotIn(target, [(5, 5), (6, 5)] + misses)
+        self.assertEqual(player.moves, [target])
+        
+        
+    def test_blocked_single_hit_falls_back_to_random(self):
+        misses = [(4, 5), (6, 5), (5, 4), (5, 6)]
+        player = self.attack_ship(hits=[(5, 5)], misses=misses)
+        target = player.select_target()
+        self.assertTrue(player.is_valid_target(target))
+        self.assertNotIn(target, [(5, 5)] + misses)
 
-cells_to_test = list(zip(range(0,12), range(0,12)))
-for cell in cells_to_test:
-    tracker.add(cell)
-    
-def cell_unvisited(cell):
-    return cell not in tracker
 
-cell = (9,9)
-print(cell_unvisited(cell))    
+    def assert_visited_after_sinking(self, hits, expected):
+        """ Sink a ship with its last hit and check the visited cells."""
+        player = self.attack_ship(hits=hits[:-1])
+        player._commit_target(hits[-1])
+        player.receive_result(is_ship_hit=True, has_ship_sunk=True)
+        visited = {cell for cell in player.cells
+                   if not player.cell_unvisited(cell)}
+        self.assertEqual(visited, expected)
+        self.assertEqual(player.ship_being_attacked, [])
+
+
+    def test_sunk_ship_in_interior(self):
+        hits = [(4, 5), (5, 5), (6, 5)]
+        expected = {(x, y) for x in range(3, 8) for y in range(4, 7)}
+        self.assert_visited_after_sinking(hits, expected)
+
+
+    def test_sunk_ship_in_corner(self):
+        hits = [(10, 8), (10, 9), (10, 10)]
+        expected = {(x, y) for x in range(9, 11) for y in range(7, 11)}
+        self.assert_visited_after_sinking(hits, expected)
+
+
+    def test_sunk_ship_on_edge(self):
+        hits = [(3, 1), (4, 1)]
+        expected = {(x, y) for x in range(2, 6) for y in range(1, 3)}
+        self.assert_visited_after_sinking(hits, expected)
+
+
+if __name__ == "__main__":
+    board=Board()
+
+    tracker = set()
+    moves = list()
+    attack_successful = False
+    ship_being_attacked = list()
+
+    width = board.width
+    height = board.height
+
+    cell = (9,0)
+
+    def is_valid_target(cell):
+        """ Checks if a cell lies within the board """
+        x_min = 1
+        y_min = 1
+        x_max = board.width
+        y_max = board.height        
+        x = cell[0]
+        y = cell[1]        
+        return (x_min <= x <= x_max and y_min <= y <= y_max)
+
+    cells_to_test = list(zip(range(0,12), range(0,12)))
+    for cell in cells_to_test:
+        tracker.add(cell)
+
+    def cell_unvisited(cell):
+        return cell not in tracker
+
+    cell = (9,9)
+    print(cell_unvisited(cell))
+
+    unittest.main()
@@ -79,6 +79,70 @@ class TestShipMethods(unittest.TestCase):
         empty_set = set()
         empty_set.add(cell_attacked)
         self.assertSetEqual(ship.damaged_cells, empty_set)
+        
+        
+    def test_damage_same_cell_twice(self):
+        start = (5, 1)
+        end = (3, 1)
+        ship = Ship(start=start, end=end)
+        cell_attacked = (4, 1)
+        ship.receive_damage(cell_attacked)
+        ship.receive_damage(cell_attacked)
+        self.assertEqual(ship.count_damaged_cells(), 1)
+        
+        
+    def test_damage_missed(self):
+        start = (5, 1)
+        end = (3, 1)
+        ship = Ship(start=start, end=end)
+        self.assertFalse(ship.receive_damage((6, 1)))
+        self.assertFalse(ship.receive_damage((4, 2)))
+        self.assertEqual(ship.count_damaged_cells(), 0)
+        
+        
+    def test_damage_unvalidated_ship(self):
+        start = (1, 1)
+        end = (3, 3)
+        ship = Ship(start=start, end=end, should_validate=False)
+        self.assertFalse(ship.receive_damage((2, 2)))
+        self.assertTrue(ship.receive_damage((2, 1)))
+        self.assertSetEqual(ship.damaged_cells, {(2, 1)})
+        
+        
+    def test_damaged_cells_horizontal(self):
+        start = (5, 1)
+        end = (3, 1)
+        ship = Ship(start=start, end=end)
+        ship.receive_damage((5, 1))
+        ship.receive_damage((3, 1))
+        self.assertSetEqual(ship.damaged_cells, {(3, 1), (5, 1)})
+        
+        
+    def test_damaged_cells_vertical(self):
+        start = (2, 7)
+        end = (2, 4)
+        ship = Ship(start=start, end=end)
+        ship.receive_damage((2, 5))
+        ship.receive_damage((2, 7))
+        self.assertSetEqual(ship.damaged_cells, {(2, 5), (2, 7)})
+        
+        
+    def test_not_sunk(self):
+        start = (2, 7)
+        end = (2, 4)
+        ship = Ship(start=start, end=end)
+        for cell in [(2, 4), (2, 5), (2, 7)]:
+            ship.receive_damage(cell)
+        self.assertFalse(ship.has_sunk())
+        
+        
+    def test_sunk(self):
+        start = (2, 7)
+        end = (2, 4)
+        ship = Ship(start=start, end=end)
+        for cell in [(2, 4), (2, 5), (2, 6), (2, 7)]:
+            ship.receive_damage(cell)
+        self.assertTrue(ship.has_sunk())
     
         
     def test_near_other_ship(self):
@@ -102,7 +166,11 @@ class TestShipMethods(unittest.TestCase):
     
         
     def test_build_ship(self):
-        for i in range(1000):
+        # keep the generated boards reproducible, without leaving the global
+        # random state seeded for other tests
+        self.addCleanup(random.setstate, random.getstate())
+        random.seed(0)
+        for i in range(100):
             ships = ShipFactory().generate_ships()
             random_idx = random.randint(0, len(ships)-1)
             ship_to_check = ships[random_idx]